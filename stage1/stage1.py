@@ -2,8 +2,17 @@ import argparse
 import json
 import os
 import sys
+from functools import lru_cache
 from urllib.parse import urlparse
 
+# orjson разбирает JSON заметно быстрее стандартного модуля;
+# если он не установлен, используем json из стандартной библиотеки.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # Допустимые значения режима работы с тестовым репозиторием
 ALLOWED_TEST_MODES = {"off", "local-file", "mock"}
 
@@ -31,110 +40,188 @@ def is_probably_url(s: str) -> bool:
         return False
 
 
+# Схема конфигурации в стиле JSON Schema.
+# Для каждого параметра описаны ограничения и тексты ошибок при их нарушении.
+CONFIG_SCHEMA = {
+    "package_name": {
+        "type": "string",
+        "minLength": 1,
+        "messages": {
+            "type": "Параметр 'package_name' должен быть непустой строкой.",
+        },
+    },
+    "repo": {
+        "type": "string",
+        "minLength": 1,
+        "messages": {
+            "type": "Параметр 'repo' должен быть непустой строкой (URL или локальный путь).",
+        },
+    },
+    "test_repo_mode": {
+        "type": "string",
+        "enum": sorted(ALLOWED_TEST_MODES),
+        "messages": {
+            "type": "Параметр 'test_repo_mode' должен быть строкой.",
+        },
+    },
+    "output_image": {
+        "type": "string",
+        "minLength": 1,
+        "extensions": sorted(ALLOWED_IMAGE_EXTS),
+        "messages": {
+            "type": "Параметр 'output_image' должен быть непустой строкой.",
+        },
+    },
+    "max_depth": {
+        "type": "integer",
+        "minimum": 0,
+        "messages": {
+            "bool": "Параметр 'max_depth' должен быть целым числом >= 0, не boolean.",
+            "type": "Параметр 'max_depth' должен быть целым числом.",
+            "minimum": "Параметр 'max_depth' должен быть >= 0.",
+        },
+    },
+    "filter_substring": {
+        "type": "string",
+        "messages": {
+            "type": "Параметр 'filter_substring' должен быть строкой (может быть пустой).",
+        },
+    },
+}
+
+
+# Коды ошибок проверки. В горячем пути копятся только пары (код, параметр),
+# тексты сообщений собирает _format_errors, и только если ошибки есть.
+ERR_MISSING = 1         # параметр отсутствует
+ERR_TYPE = 2            # неверный тип или пустая строка
+ERR_BOOL = 3            # boolean вместо целого числа
+ERR_MINIMUM = 4         # число меньше минимума
+ERR_ENUM = 5            # значение не из списка допустимых
+ERR_EXTENSION = 6       # расширение файла не из списка допустимых
+ERR_REPO_NOT_FOUND = 7  # режим local-file, но путь из 'repo' не существует
+
+# Коды, текст которых берётся из поля "messages" схемы
+_SCHEMA_MESSAGE_KEYS = {ERR_TYPE: "type", ERR_BOOL: "bool", ERR_MINIMUM: "minimum"}
+
+
+def _extension_error(key: str, value: str) -> str:
+    """
+    Формирует текст ошибки для значения, не подошедшего под 'extensions'.
+    Для output_image сообщаем, чего именно не хватает: расширения или его поддержки.
+    """
+    _, ext = os.path.splitext(value)
+    if not ext:
+        return f"Параметр '{key}' должен содержать расширение (.png/.svg/.pdf)."
+    return (
+        f"Расширение '{ext}' не поддерживается. "
+        f"Допустимые: {sorted(ALLOWED_IMAGE_EXTS)}"
+    )
+
+
+def _format_errors(errors: list, cfg: dict) -> str:
+    """
+    Превращает список пар (код, параметр) в текст ошибок для пользователя.
+    Вызывается только для некорректной конфигурации.
+    """
+    lines = []
+    for code, key in errors:
+        value = cfg.get(key)
+        if code == ERR_MISSING:
+            lines.append(f"Отсутствует параметр '{key}'.")
+        elif code in _SCHEMA_MESSAGE_KEYS:
+            lines.append(CONFIG_SCHEMA[key]["messages"][_SCHEMA_MESSAGE_KEYS[code]])
+        elif code == ERR_ENUM:
+            lines.append(
+                f"Неверное значение '{key}': {value}. "
+                f"Допустимые значения: {sorted(CONFIG_SCHEMA[key]['enum'])}"
+            )
+        elif code == ERR_EXTENSION:
+            lines.append(_extension_error(key, value.strip()))
+        elif code == ERR_REPO_NOT_FOUND:
+            lines.append(
+                f"Режим 'local-file' указан, но путь, указанный в 'repo', не существует: {value.strip()}"
+            )
+    return "\n".join(lines)
+
+
+def _compile_field(key: str, rules: dict):
+    """
+    Превращает описание одного параметра из схемы в функцию проверки.
+    Функция возвращает код ошибки или 0, если значение корректно.
+    """
+    is_string = rules["type"] == "string"
+    min_length = rules.get("minLength", 0)
+    enum = frozenset(rules["enum"]) if "enum" in rules else None
+    # Множество расширений собирается один раз, а не при каждой проверке.
+    # Расширения сравниваются без учёта регистра, как и раньше.
+    extensions = frozenset(rules["extensions"]) if "extensions" in rules else None
+    minimum = rules.get("minimum")
+
+    if is_string:
+        def check(value):
+            if not isinstance(value, str) or len(value.strip()) < min_length:
+                return ERR_TYPE
+            if enum is not None and value not in enum:
+                return ERR_ENUM
+            if extensions is not None and os.path.splitext(value.strip())[1].lower() not in extensions:
+                return ERR_EXTENSION
+            return 0
+    else:
+        def check(value):
+            # bool — это наследник int, поэтому нужно проверять отдельно
+            if isinstance(value, bool):
+                return ERR_BOOL
+            if not isinstance(value, int):
+                return ERR_TYPE
+            if minimum is not None and value < minimum:
+                return ERR_MINIMUM
+            return 0
+
+    return check
+
+
+@lru_cache(maxsize=None)
+def _get_validator():
+    """
+    Компилирует CONFIG_SCHEMA в список проверок.
+    Выполняется один раз, дальнейшие вызовы берут результат из кэша.
+    """
+    return tuple((key, _compile_field(key, rules)) for key, rules in CONFIG_SCHEMA.items())
+
+
 def validate_config(cfg: dict) -> dict:
     """
     Проверяет корректность всех параметров конфигурации.
     Возвращает очищенный словарь, либо выбрасывает ConfigError.
     """
 
-    errors = []  # накапливаем ошибки, чтобы вывести их все разом
+    errors = []  # накапливаем пары (код, параметр), чтобы вывести все ошибки разом
 
-    
-    # Проверка параметра package_name
-    
-    package_name = cfg.get("package_name")
-    if package_name is None:
-        errors.append("Отсутствует параметр 'package_name'.")
-    elif not isinstance(package_name, str) or not package_name.strip():
-        errors.append("Параметр 'package_name' должен быть непустой строкой.")
+    # Проверка параметров по скомпилированной схеме
+    for key, check in _get_validator():
+        value = cfg.get(key)
+        code = ERR_MISSING if value is None else check(value)
+        if code:
+            errors.append((code, key))
 
-    
-    # Проверка параметра repo
-    
+    package_name = cfg.get("package_name")
     repo = cfg.get("repo")
-    if repo is None:
-        errors.append("Отсутствует параметр 'repo'.")
-    elif not isinstance(repo, str) or not repo.strip():
-        errors.append("Параметр 'repo' должен быть непустой строкой (URL или локальный путь).")
-    else:
-        repo_str = repo.strip()
-
-        # Если значение похоже на URL — проверяем базовую валидность
-        if is_probably_url(repo_str):
-            p = urlparse(repo_str)
-            if not p.scheme or not (p.netloc or p.path):
-                errors.append(f"'repo' похоже на URL, но невалидно: {repo_str}")
-        # Если не похоже на URL — считаем локальным путем (будем проверять позже)
-
-    
-    # Проверка test_repo_mode
-    
     mode = cfg.get("test_repo_mode")
-    if mode is None:
-        errors.append("Отсутствует параметр 'test_repo_mode'.")
-    elif not isinstance(mode, str):
-        errors.append("Параметр 'test_repo_mode' должен быть строкой.")
-    elif mode not in ALLOWED_TEST_MODES:
-        errors.append(
-            f"Неверное значение 'test_repo_mode': {mode}. "
-            f"Допустимые значения: {sorted(ALLOWED_TEST_MODES)}"
-        )
-
-    
-    # Проверка output_image
-    
     out = cfg.get("output_image")
-    if out is None:
-        errors.append("Отсутствует параметр 'output_image'.")
-    elif not isinstance(out, str) or not out.strip():
-        errors.append("Параметр 'output_image' должен быть непустой строкой.")
-    else:
-        _, ext = os.path.splitext(out.strip())
-        if not ext:
-            errors.append("Параметр 'output_image' должен содержать расширение (.png/.svg/.pdf).")
-        elif ext.lower() not in ALLOWED_IMAGE_EXTS:
-            errors.append(
-                f"Расширение '{ext}' не поддерживается. "
-                f"Допустимые: {sorted(ALLOWED_IMAGE_EXTS)}"
-            )
-
-    
-    # Проверка max_depth
-    
     max_depth = cfg.get("max_depth")
-    if max_depth is None:
-        errors.append("Отсутствует параметр 'max_depth'.")
-    elif isinstance(max_depth, bool):
-        # bool — это наследник int, поэтому нужно проверять отдельно
-        errors.append("Параметр 'max_depth' должен быть целым числом >= 0, не boolean.")
-    elif not isinstance(max_depth, int):
-        errors.append("Параметр 'max_depth' должен быть целым числом.")
-    elif max_depth < 0:
-        errors.append("Параметр 'max_depth' должен быть >= 0.")
-
-    
-    # Проверка filter_substring
-    
     fsub = cfg.get("filter_substring")
-    if fsub is None:
-        errors.append("Отсутствует параметр 'filter_substring'.")
-    elif not isinstance(fsub, str):
-        errors.append("Параметр 'filter_substring' должен быть строкой (может быть пустой).")
 
     
     # Дополнительные проверки связки параметров
     
     if isinstance(mode, str) and mode == "local-file" and isinstance(repo, str):
-        repo_path = repo.strip()
         # В режиме "local-file" путь обязан существовать
-        if not os.path.exists(repo_path):
-            errors.append(
-                f"Режим 'local-file' указан, но путь, указанный в 'repo', не существует: {repo_path}"
-            )
+        if not os.path.exists(repo.strip()):
+            errors.append((ERR_REPO_NOT_FOUND, "repo"))
 
     # Если есть ошибки — выводим их все сразу
     if errors:
-        raise ConfigError("\n".join(errors))
+        raise ConfigError(_format_errors(errors, cfg))
 
     # Возвращаем нормализованную конфигурацию
     return {
@@ -153,13 +240,12 @@ def load_config_from_file(path: str) -> dict:
     Выбрасывает ConfigError при любой проблеме.
     """
 
-    # Проверка существования файла
-    if not os.path.exists(path):
-        raise ConfigError(f"Файл конфигурации не найден: {path}")
-
+    # Отсутствие файла определяем по ошибке open, без отдельной проверки exists
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = json_loads(f.read())
+    except FileNotFoundError:
+        raise ConfigError(f"Файл конфигурации не найден: {path}")
     except json.JSONDecodeError as e:
         raise ConfigError(f"Ошибка разбора JSON в файле {path}: {e}")
     except Exception as e:
@@ -9,16 +9,35 @@ import argparse
 import json
 import os
 import sys
+from functools import lru_cache
 import xml.etree.ElementTree as ET
 
+# orjson разбирает JSON заметно быстрее стандартного модуля;
+# если он не установлен, используем json из стандартной библиотеки.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # -----------------------------
 # Загрузка и минимальная валидация конфига
 # -----------------------------
+@lru_cache(maxsize=32)
+def _read_json_cached(path, mtime):
+    # mtime входит в ключ кэша: изменённый файл будет прочитан заново
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
 def load_config(path):
-    if not os.path.exists(path):
+    # отсутствие файла определяем по ошибке, без отдельной проверки exists
+    try:
+        data = _read_json_cached(path, os.path.getmtime(path))
+    except FileNotFoundError:
         raise FileNotFoundError(f"Конфиг не найден: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        cfg = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("JSON-конфигурация должна быть объектом (ключ-значение).")
+    cfg = data.copy()  # копия, чтобы изменения не попадали в кэш
     # минимальная валидация
     if "package_name" not in cfg or not cfg["package_name"].strip():
         raise ValueError("package_name обязателен")
@@ -43,25 +62,50 @@ def find_pom(root_path):
 # -----------------------------
 # Парсинг прямых зависимостей
 # -----------------------------
-def parse_dependencies(pom_path):
-    tree = ET.parse(pom_path)
-    root = tree.getroot()
-
-    def local(tag): return tag.split("}")[-1] if "}" in tag else tag
+# Поля зависимости, которые нас интересуют
+DEP_FIELDS = ("groupId", "artifactId", "version", "scope")
 
+def parse_dependencies(pom_path):
+    # Потоковый разбор: дерево целиком в памяти не строится.
+    # Каждый закрытый элемент сразу отсоединяется от родителя, кроме прямых
+    # потомков <dependency> — их поля читаются при закрытии самой зависимости.
+    # Пространство имён POM определяется по корневому элементу, после чего
+    # теги сравниваются с заранее собранными полными именами, без разбора {*}.
     deps = []
-    for dep_parent in root.findall(".//{*}dependencies"):
-        for dep in dep_parent.findall("{*}dependency"):
-            gid = dep.find("{*}groupId")
-            aid = dep.find("{*}artifactId")
-            ver = dep.find("{*}version")
-            scope = dep.find("{*}scope")
+    path = []  # открытые элементы, от корня к текущему
+    for event, elem in ET.iterparse(pom_path, events=("start", "end")):
+        if event == "start":
+            path.append(elem)
+            if len(path) == 1:
+                tag = elem.tag
+                prefix = tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+                dependency_tag = prefix + "dependency"
+                dependencies_tag = prefix + "dependencies"
+                field_tags = {prefix + name: name for name in DEP_FIELDS}
+            continue
+        path.pop()
+        if not path:
+            continue                         # закрылся корень
+        parent = path[-1]
+        if parent.tag == dependency_tag:
+            continue                         # поле зависимости, нужно до её закрытия
+        if elem.tag == dependency_tag and parent.tag == dependencies_tag:
+            fields = {}
+            for child in elem:
+                name = field_tags.get(child.tag)
+                if name is not None and name not in fields:
+                    fields[name] = child.text
+            gid, aid = fields.get("groupId"), fields.get("artifactId")
+            ver, scope = fields.get("version"), fields.get("scope")
             deps.append({
-                "groupId": (gid.text.strip() if gid is not None and gid.text else ""),
-                "artifactId": (aid.text.strip() if aid is not None and aid.text else ""),
-                "version": (ver.text.strip() if ver is not None and ver.text else "<no-version>"),
-                "scope": (scope.text.strip() if scope is not None and scope.text else "compile"),
+                "groupId": (gid.strip() if gid else ""),
+                "artifactId": (aid.strip() if aid else ""),
+                "version": (ver.strip() if ver else "<no-version>"),
+                "scope": (scope.strip() if scope else "compile"),
             })
+        # Закрытый элемент — последний потомок родителя; удаляем всех потомков,
+        # чтобы в памяти оставалась только текущая ветка дерева
+        del parent[:]
     return deps
 
 # -----------------------------
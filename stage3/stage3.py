@@ -2,7 +2,16 @@ import argparse
 import json
 import os
 import sys
-from collections import deque, defaultdict
+from collections import defaultdict
+from functools import lru_cache
+
+# orjson разбирает JSON заметно быстрее стандартного модуля;
+# если он не установлен, используем json из стандартной библиотеки.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 class ConfigError(Exception):
     pass
@@ -10,11 +19,21 @@ class ConfigError(Exception):
 
 # Конфигурация
 
+@lru_cache(maxsize=32)
+def _read_json_cached(path, mtime):
+    # mtime входит в ключ кэша: изменённый файл будет прочитан заново
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
 def load_config(path):
-    if not os.path.exists(path):
+    # отсутствие файла определяем по ошибке, без отдельной проверки exists
+    try:
+        data = _read_json_cached(path, os.path.getmtime(path))
+    except FileNotFoundError:
         raise ConfigError(f"Файл конфигурации не найден: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        cfg = json.load(f)
+    if not isinstance(data, dict):
+        raise ConfigError("JSON-конфигурация должна быть объектом (ключ-значение).")
+    cfg = data.copy()  # копия, чтобы изменения не попадали в кэш
 
     # Минимальная валидация для этапа 3
     required = ["package_name", "test_repo_mode"]
@@ -44,12 +63,10 @@ def read_test_graph(file_path):
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            if ":" not in line:
+            pkg, sep, deps = line.partition(":")
+            if not sep:
                 continue
-            pkg, deps = line.split(":", 1)
-            pkg = pkg.strip()
-            dep_list = [d.strip() for d in deps.split(",") if d.strip()]
-            graph[pkg] = dep_list
+            graph[pkg.strip()] = [d for d in map(str.strip, deps.split(",")) if d]
     return graph
 
 
@@ -58,22 +75,26 @@ def read_test_graph(file_path):
 def bfs_dependencies(graph, start_pkg, max_depth=1000, filter_substring=""):
     visited = set()
     result = []
-    queue = deque()
-    queue.append((start_pkg, 0))
-
-    while queue:
-        node, depth = queue.popleft()        # Извлекаем узел и его текущую глубину из очереди
-        if node in visited:
-            continue                         # Если узел уже обработан, пропускаем его (чтобы избежать повторов и циклов)
-        if filter_substring and filter_substring in node:
-            continue                         # Если имя узла содержит фильтрующую подстроку, пропускаем его и его зависимости
-        visited.add(node)                     # Помечаем узел как посещённый
-        result.append((node, depth))         # Добавляем узел и его глубину в результирующий список
-        if depth >= max_depth:
-            continue                         # Если достигли максимальной глубины обхода, не добавляем его зависимости в очередь
-        for dep in graph.get(node, []):      # Для каждой зависимости текущего узла
-            queue.append((dep, depth + 1))   # Добавляем зависимость в очередь с увеличенной глубиной на 1
-    
+    # BFS по уровням: вместо очереди пар (узел, глубина) храним список узлов
+    # текущего уровня, а зависимости добавляем в следующий уровень
+    # за один вызов extend. Порядок обхода тот же, что и у очереди.
+    level = [start_pkg]
+    depth = 0
+
+    while level:
+        next_level = []
+        for node in level:
+            if node in visited:
+                continue                     # Узел уже обработан или отфильтрован — пропускаем его и его зависимости
+            visited.add(node)                # Помечаем узел как посещённый (и отфильтрованный тоже: подстрока проверяется один раз на узел)
+            if filter_substring and filter_substring in node:
+                continue                     # Если имя узла содержит фильтрующую подстроку, пропускаем его и его зависимости
+            result.append((node, depth))     # Добавляем узел и его глубину в результирующий список
+            if depth < max_depth:            # На максимальной глубине зависимости в следующий уровень не попадают
+                next_level.extend(graph.get(node, ()))
+        level = next_level
+        depth += 1
+
     return result
 
 # Основная функция
@@ -2,17 +2,37 @@ import argparse
 import json
 import os
 import sys
+from array import array
 from collections import defaultdict, deque
+from functools import lru_cache
+
+# orjson разбирает JSON заметно быстрее стандартного модуля;
+# если он не установлен, используем json из стандартной библиотеки.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 class ConfigError(Exception):
     pass
 
 # --- Загрузка конфигурации ---
+@lru_cache(maxsize=32)
+def _read_json_cached(path, mtime):
+    # mtime входит в ключ кэша: изменённый файл будет прочитан заново
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
 def load_config(path):
-    if not os.path.exists(path):
+    # отсутствие файла определяем по ошибке, без отдельной проверки exists
+    try:
+        data = _read_json_cached(path, os.path.getmtime(path))
+    except FileNotFoundError:
         raise ConfigError(f"Файл конфигурации не найден: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        cfg = json.load(f)
+    if not isinstance(data, dict):
+        raise ConfigError("JSON-конфигурация должна быть объектом (ключ-значение).")
+    cfg = data.copy()  # копия, чтобы изменения не попадали в кэш
     required = ["package_name", "test_repo_mode"]
     for r in required:
         if r not in cfg or not cfg[r].strip():
@@ -32,57 +52,128 @@ def read_test_graph(file_path):
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            if ":" not in line:
+            pkg, sep, deps = line.partition(":")
+            if not sep:
                 continue
-            pkg, deps = line.split(":", 1)
-            pkg = pkg.strip()
-            dep_list = [d.strip() for d in deps.split(",") if d.strip()]
-            graph[pkg] = dep_list
+            graph[pkg.strip()] = [d for d in map(str.strip, deps.split(",")) if d]
     return graph
 
+# --- Представление графа в формате CSR ---
+def to_csr(graph, start_pkg, max_depth=None, filter_substring=""):
+    # Узлы, достижимые из start_pkg, нумеруются (start_pkg — 0),
+    # зависимости узла u: flat[offsets[u]:offsets[u + 1]].
+    # max_depth и filter_substring ограничивают построение одним BFS-обходом;
+    # для общего графа BFS и сортировки (main) строится полный CSR
+    id_of = {start_pkg: 0}
+    names = [start_pkg]
+    offsets = array("i", [0])
+    flat = array("i")
+    u = 0
+    depth = 0
+    level_end = 1
+    while u < len(names):
+        if u == level_end:
+            depth += 1
+            level_end = len(names)
+        if max_depth is None or depth < max_depth:
+            for dep in graph.get(names[u], ()):
+                v = id_of.get(dep)
+                if v is None:
+                    if filter_substring and filter_substring in dep:
+                        id_of[dep] = -1
+                        continue
+                    v = id_of[dep] = len(names)
+                    names.append(dep)
+                elif v < 0:
+                    continue
+                flat.append(v)
+        offsets.append(len(flat))
+        u += 1
+    return names, offsets, flat
+
 # --- BFS обход графа (из этапа 3) ---
 def bfs_dependencies(graph, start_pkg, max_depth=1000, filter_substring=""):
-    visited = set()
+    return bfs_csr(to_csr(graph, start_pkg, max_depth, filter_substring), max_depth, filter_substring)
+
+def bfs_csr(csr, max_depth=1000, filter_substring=""):
+    # csr — результат to_csr; обход начинается с узла 0 (start_pkg)
+    names, offsets, flat = csr
+    if filter_substring:
+        visited = bytearray(filter_substring in name for name in names)
+    else:
+        visited = bytearray(len(names))
     result = []
-    queue = deque()
-    queue.append((start_pkg, 0))
-    while queue:
-        node, depth = queue.popleft()
-        if node in visited:
-            continue
-        if filter_substring and filter_substring in node:
-            continue
-        visited.add(node)
-        result.append((node, depth))
-        if depth >= max_depth:
-            continue
-        for dep in graph.get(node, []):
-            queue.append((dep, depth + 1))
+    # Обход по уровням: без пар (узел, глубина) в очереди
+    level = [0]
+    depth = 0
+    while level:
+        next_level = []
+        for u in level:
+            if visited[u]:
+                continue
+            visited[u] = 1
+            result.append((names[u], depth))
+            if depth < max_depth:
+                next_level.extend(flat[offsets[u]:offsets[u + 1]])
+        level = next_level
+        depth += 1
     return result
 
 # --- Topological sort (порядок загрузки зависимостей) ---
 def topological_sort(graph, start_pkg):
-    visited = set()
-    temp_mark = set()  # для обнаружения циклов
-    result = []
+    return topological_sort_csr(to_csr(graph, start_pkg))
 
-    def visit(node):
-        if node in temp_mark:
-            raise ValueError(f"Обнаружен цикл в зависимостях: {node}")
-        if node not in visited:
-            temp_mark.add(node)
-            for dep in graph.get(node, []):
-                visit(dep)
-            temp_mark.remove(node)
-            visited.add(node)
-            result.append(node)
+def topological_sort_csr(csr):
+    # Итеративный алгоритм Кана: без рекурсии, поэтому глубокие графы
+    # не упираются в лимит стека. Работает по CSR-массивам узлов,
+    # достижимых из start_pkg.
+    names, offsets, flat = csr
+    n = len(names)
+    indeg = array("i", [0]) * n
+    for v in flat:
+        indeg[v] += 1
 
-    try:
-        visit(start_pkg)
-    except ValueError as e:
-        print("Предупреждение:", e)
-    result.reverse()  # инвертируем для порядка загрузки
-    return result
+    queue = deque(u for u in range(n) if not indeg[u])
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v in flat[offsets[u]:offsets[u + 1]]:
+            indeg[v] -= 1
+            if not indeg[v]:
+                queue.append(v)
+
+    # Если обработаны не все узлы — оставшиеся лежат на цикле или за ним;
+    # сам цикл находим отдельным обходом в глубину
+    if len(order) != n:
+        node = names[find_cycle_node(offsets, flat)]
+        print("Предупреждение:", f"Обнаружен цикл в зависимостях: {node}")
+    return [names[u] for u in order]
+
+# --- Поиск узла на цикле ---
+def find_cycle_node(offsets, flat):
+    # Итеративный DFS из узла 0 с тремя состояниями, как в прежней рекурсивной
+    # сортировке: 0 — не посещён, 1 — на стеке, 2 — обработан.
+    # Возвращает первый узел, в который ведёт обратное ребро (он лежит на цикле),
+    # или None, если цикла нет.
+    state = bytearray(len(offsets) - 1)
+    state[0] = 1
+    stack = [[0, offsets[0]]]
+    while stack:
+        top = stack[-1]
+        u, k = top
+        if k == offsets[u + 1]:
+            state[u] = 2
+            stack.pop()
+            continue
+        top[1] = k + 1
+        v = flat[k]
+        if state[v] == 1:
+            return v
+        if not state[v]:
+            state[v] = 1
+            stack.append([v, offsets[v]])
+    return None
 
 # --- Основная функция ---
 def main():
@@ -107,15 +198,18 @@ def main():
 
     print("Граф зависимостей:", graph)
 
+    # CSR строится один раз и используется и для BFS, и для сортировки
+    csr = to_csr(graph, start_pkg)
+
     # Порядок обхода BFS (как в этапе 3)
-    bfs_result = bfs_dependencies(graph, start_pkg, cfg["max_depth"], cfg["filter_substring"])
+    bfs_result = bfs_csr(csr, cfg["max_depth"], cfg["filter_substring"])
     print("\nBFS обход (node : depth):")
     for node, depth in bfs_result:
         print(f"- {node} : {depth}")
 
     # Топологическая сортировка (порядок загрузки)
     print("\nПорядок загрузки зависимостей (topological sort):")
-    load_order = topological_sort(graph, start_pkg)
+    load_order = topological_sort_csr(csr)
     print(" -> ".join(load_order))
 
 if __name__ == "__main__":
@@ -1,70 +1,175 @@
 import argparse
 import json
+import mmap
 import os
+import re
 import sys
 import subprocess
-from collections import defaultdict
+from collections import deque
+from functools import lru_cache
+
+# orjson разбирает JSON заметно быстрее стандартного модуля;
+# если он не установлен, используем json из стандартной библиотеки.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 class ConfigError(Exception):
     pass
 
 # --- Загрузка конфигурации ---
+@lru_cache(maxsize=32)
+def _read_json_cached(path, mtime):
+    # mtime входит в ключ кэша: изменённый файл будет прочитан заново
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
 def load_config(path):
-    if not os.path.exists(path):
+    # отсутствие файла определяем по ошибке, без отдельной проверки exists
+    try:
+        data = _read_json_cached(path, os.path.getmtime(path))
+    except FileNotFoundError:
         raise ConfigError(f"Файл конфигурации не найден: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        cfg = json.load(f)
+    if not isinstance(data, dict):
+        raise ConfigError("JSON-конфигурация должна быть объектом (ключ-значение).")
+    cfg = data.copy()  # копия, чтобы изменения не попадали в кэш
     required = ["test_repo_mode", "test_graph_file", "output_image"]
     for r in required:
         if r not in cfg or not cfg[r].strip():
             raise ConfigError(f"Параметр '{r}' обязателен")
     return cfg
 
-# --- Чтение графа из тестового файла ---
-def read_test_graph(file_path):
-    graph = defaultdict(list)
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or ":" not in line:
+# Непустая строка файла графа без символов перевода строки
+LINE_RE = re.compile(rb"[^\r\n]+")
+
+# --- Ленивое чтение графа из тестового файла ---
+class LazyGraph:
+    # Первый проход по отображённому в память файлу строит только индекс
+    # {пакет: (начало, конец) списка зависимостей}. Сам список разбирается
+    # при первом обращении к пакету, поэтому при обходе части графа
+    # остальные строки не декодируются.
+    # Поддерживает get(), in, итерацию по пакетам и len(), как dict.
+
+    def __init__(self, file_path):
+        self._file = open(file_path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = b""                 # пустой файл нельзя отобразить в память
+        self._index = {}
+        self._deps = {}
+
+        # Строки разделяются так же, как в текстовом режиме: \n, \r\n или \r
+        for m in LINE_RE.finditer(self._data):
+            line = m.group()
+            head = line.lstrip()
+            if not head or head[:1] == b"#":
                 continue
-            pkg, deps = line.split(":", 1)
-            pkg = pkg.strip()
-            dep_list = [d.strip() for d in deps.split(",") if d.strip()]
-            graph[pkg] = dep_list
-    return graph
+            k = line.find(b":")
+            if k < 0:
+                continue
+            pkg = line[:k].strip().decode("utf-8")
+            self._index[pkg] = (m.start() + k + 1, m.end())
 
-# --- Генерация текста Mermaid для заданного пакета ---
-def generate_mermaid(graph, start_pkg):
-    visited = set()
-    lines = ["graph TD"]
+    def get(self, pkg, default=None):
+        deps = self._deps.get(pkg)
+        if deps is None:
+            span = self._index.get(pkg)
+            if span is None:
+                return default
+            raw = self._data[span[0]:span[1]].decode("utf-8")
+            deps = self._deps[pkg] = [d for d in map(str.strip, raw.split(",")) if d]
+        return deps
+
+    def __contains__(self, pkg):
+        return pkg in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
 
-    def visit(node):
-        if node in visited:
-            return
-        visited.add(node)
-        for dep in graph.get(node, []):
-            lines.append(f"    {node} --> {dep}")
-            visit(dep)
+    def __enter__(self):
+        return self
 
-    visit(start_pkg)
+    def __exit__(self, *exc):
+        self.close()
+
+# --- Строки рёбер узла (кэшируются между вызовами generate_mermaid) ---
+def node_edges(graph, node, edge_cache):
+    edges = edge_cache.get(node)
+    if edges is None:
+        prefix = f"    {node} --> "
+        edges = edge_cache[node] = [prefix + dep for dep in graph.get(node, ())]
+    return edges
+
+# --- Генерация текста Mermaid для заданного пакета ---
+def generate_mermaid(graph, start_pkg, edge_cache=None):
+    # Итеративный DFS: на стеке лежат итераторы по парам (зависимость, строка ребра),
+    # порядок рёбер тот же, что и при рекурсивном обходе.
+    # edge_cache можно передавать между вызовами для разных пакетов одного графа:
+    # строки рёбер каждого узла тогда формируются только один раз.
+    if edge_cache is None:
+        edge_cache = {}
+    lines = ["graph TD"]
+    visited = {start_pkg}
+    stack = [zip(graph.get(start_pkg, ()), node_edges(graph, start_pkg, edge_cache))]
+    while stack:
+        for dep, edge in stack[-1]:
+            lines.append(edge)
+            if dep not in visited:
+                visited.add(dep)
+                stack.append(zip(graph.get(dep, ()), node_edges(graph, dep, edge_cache)))
+                break
+        else:
+            stack.pop()
     return "\n".join(lines)
 
 # --- Сохранение .mmd и конвертация в PNG ---
-def save_mermaid_png(mermaid_text, base_name):
-    mmd_file = f"{base_name}.mmd"
-    png_file = f"{base_name}.png"
+def wait_mermaid_job(job):
+    proc, args, png_file = job
+    returncode = proc.wait()
+    if returncode:
+        print("Ошибка при генерации PNG:", subprocess.CalledProcessError(returncode, args))
+    else:
+        print(f"Сгенерирован PNG: {png_file}")
 
-    with open(mmd_file, "w", encoding="utf-8") as f:
-        f.write(mermaid_text)
+def save_mermaid_pngs(diagrams):
+    # diagrams — список пар (mermaid_text, base_name).
+    # Сначала записываются все .mmd (они нужны и без mmdc), затем процессы
+    # mmdc запускаются параллельно, но не больше os.cpu_count() одновременно:
+    # каждый из них поднимает свой headless Chromium.
+    files = []
+    for mermaid_text, base_name in diagrams:
+        mmd_file = f"{base_name}.mmd"
+        png_file = f"{base_name}.png"
 
-    try:
-        subprocess.run(["mmdc", "-i", mmd_file, "-o", png_file], check=True)
-        print(f"Сгенерирован PNG: {png_file}")
-    except FileNotFoundError:
-        print("Mermaid CLI (mmdc) не найден. Установите Node.js и mmdc, чтобы генерировать PNG.")
-    except subprocess.CalledProcessError as e:
-        print("Ошибка при генерации PNG:", e)
+        with open(mmd_file, "w", encoding="utf-8") as f:
+            f.write(mermaid_text)
+        files.append((mmd_file, png_file))
+
+    max_jobs = os.cpu_count() or 1
+    jobs = deque()
+    for mmd_file, png_file in files:
+        if len(jobs) >= max_jobs:
+            wait_mermaid_job(jobs.popleft())  # ждём самый старый процесс
+        args = ["mmdc", "-i", mmd_file, "-o", png_file]
+        try:
+            jobs.append((subprocess.Popen(args), args, png_file))
+        except FileNotFoundError:
+            print("Mermaid CLI (mmdc) не найден. Установите Node.js и mmdc, чтобы генерировать PNG.")
+            break
+
+    while jobs:
+        wait_mermaid_job(jobs.popleft())
 
 # --- Основная функция ---
 def main():
@@ -82,18 +187,25 @@ def main():
         print("Используйте test_repo_mode=file для тестирования.")
         sys.exit(2)
 
-    graph = read_test_graph(cfg["test_graph_file"])
-    print("Граф зависимостей:", graph)
-
     # Демонстрация для трёх пакетов (можно менять)
     test_packages = ["A", "B", "C"]
-    for pkg in test_packages:
-        if pkg not in graph:
-            print(f"Пакет {pkg} отсутствует в графе.")
-            continue
-        print(f"\nГенерация Mermaid для пакета {pkg}...")
-        mermaid_text = generate_mermaid(graph, pkg)
-        save_mermaid_png(mermaid_text, f"{cfg['output_image'].split('.')[0]}_{pkg}")
+    diagrams = []
+    edge_cache = {}  # общий для всех пакетов: подграфы часто пересекаются
+    with LazyGraph(cfg["test_graph_file"]) as graph:
+        # Выводим только список пакетов: зависимости разбираются лишь при обходе
+        print("Пакеты в графе:", ", ".join(graph))
+
+        for pkg in test_packages:
+            if pkg not in graph:
+                print(f"Пакет {pkg} отсутствует в графе.")
+                continue
+            print(f"\nГенерация Mermaid для пакета {pkg}...")
+            mermaid_text = generate_mermaid(graph, pkg, edge_cache)
+            diagrams.append((mermaid_text, f"{cfg['output_image'].split('.')[0]}_{pkg}"))
+
+    # PNG для всех пакетов рендерятся одним пакетом запусков mmdc
+    print()
+    save_mermaid_pngs(diagrams)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file